@@ -0,0 +1,42 @@
+"""cover metric value in analysis index
+
+Revision ID: 4b7c2e91a0d3
+Revises: 9d5e6ee4c19b
+Create Date: 2026-10-15 10:12:31.482915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7c2e91a0d3'
+down_revision: Union[str, Sequence[str], None] = '9d5e6ee4c19b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _swap_index(include: Sequence[str]) -> None:
+    """Rebuild ix_metric_incident_name_ts without blocking writes to metric_points.
+
+    The replacement is built concurrently under a temporary name, so the old
+    index keeps serving the analysis scan until the swap. A failed or cancelled
+    concurrent build leaves an INVALID temp index behind; drop it first so the
+    migration can simply be re-run.
+    """
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_metric_incident_name_ts_new', table_name='metric_points', if_exists=True, postgresql_concurrently=True)
+        op.create_index('ix_metric_incident_name_ts_new', 'metric_points', ['incident_id', 'metric_name', 'ts'], unique=False, postgresql_include=list(include), postgresql_concurrently=True)
+        op.drop_index('ix_metric_incident_name_ts', table_name='metric_points', postgresql_concurrently=True)
+        op.execute('ALTER INDEX ix_metric_incident_name_ts_new RENAME TO ix_metric_incident_name_ts')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _swap_index(['value'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _swap_index([])
@@ -1,7 +1,12 @@
 
+import json
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+from contextvars import ContextVar
+
+import asyncpg
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.orm import scoped_session, sessionmaker, declarative_base
 from dotenv import load_dotenv
 
 # Load variables from .env into environment
@@ -12,18 +17,73 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL is not set")
 
+# Connection pool sizing (override per deployment via env)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))      # seconds to wait for a free conn
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))    # seconds before a conn is replaced
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+# asyncpg pool for the analysis path; separate from (and in addition to) the
+# SQLAlchemy pool above, so keep it small
+DB_ASYNC_POOL_SIZE = int(os.getenv("DB_ASYNC_POOL_SIZE", "5"))
+
 # Create the SQLAlchemy engine (connection pool)
 engine = create_engine(
     DATABASE_URL,
-    echo=True,  # logs SQL queries (great for learning; turn off later)
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,  # survive DB restarts / idle-killed conns
+    # batch executemany() calls: INSERTs go through multi-row VALUES pages,
+    # everything else (UPDATE/DELETE) through psycopg2's execute_batch
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=1000,
+    executemany_batch_page_size=500,
+    echo=False,  # echo stringifies every statement; far too slow for bulk ingest
 )
 
-# Factory for DB sessions (one per request)
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine,
+# Scope key for SessionLocal. The request middleware sets a fresh token per
+# request; a contextvar (not a thread-local) because FastAPI may run a sync
+# dependency and its endpoint on different threadpool workers.
+request_scope: ContextVar = ContextVar("db_request_scope", default=None)
+
+
+def _session_scope():
+    # outside an HTTP request (scripts, startup hooks, websockets) fall back to
+    # one session per thread; those callers must call SessionLocal.remove()
+    scope = request_scope.get()
+    return scope if scope is not None else threading.get_ident()
+
+# Registry of DB sessions (one per request scope; SessionLocal.remove() drops it)
+SessionLocal = scoped_session(
+    sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=engine,
+    ),
+    scopefunc=_session_scope,
 )
 
 # Base class for all ORM models
 Base = declarative_base()
+
+
+# asyncpg takes a plain libpq-style DSN, without SQLAlchemy's "+driver" suffix
+PG_DSN = make_url(DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+async def _init_pg_conn(conn):
+    # decode json columns (e.g. events.metadata) to dicts like the ORM does
+    await conn.set_type_codec("json", encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+
+async def create_pg_pool() -> asyncpg.Pool:
+    """Pool of raw asyncpg connections for read-heavy async endpoints."""
+    return await asyncpg.create_pool(
+        PG_DSN,
+        min_size=1,
+        max_size=DB_ASYNC_POOL_SIZE,
+        max_inactive_connection_lifetime=DB_POOL_RECYCLE,
+        init=_init_pg_conn,
+    )
@@ -1,29 +1,80 @@
 
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
 
-from app.db import SessionLocal, engine
+from app.db import SessionLocal, create_pg_pool, engine, request_scope
 from app import models
 from app.schemas import IngestRequest, IngestResponse
 
 from collections import defaultdict
-from datetime import timedelta
-import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import groupby
+from operator import itemgetter
+import csv
+import io
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 from app.schemas import AnalysisResponse, AnomalyOut, CauseOut, EpisodeOut
 
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# analysis payloads (every anomaly + evidence text) compress very well
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
+# how many ranked causes the analysis returns, and evidence lines per cause
+MAX_CAUSES = 5
+MAX_EVIDENCE = 6
+
+
+@dataclass(slots=True)
+class Episode:
+    """A run of anomalies on one metric with no gap longer than the episode gap."""
+    metric: str
+    start: datetime
+    end: datetime
+    max_abs_z: float
+    baseline_mean: float
+    baseline_std: float
+    max_value: float
 
 
 # --- DB session per request ---
+class DBSessionScope:
+    """Pure ASGI middleware giving each HTTP request its own SessionLocal scope."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = request_scope.set(object())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # only requests that used get_db have a session to tear down; closing
+            # it may roll back over the wire, so keep that off the event loop
+            if SessionLocal.registry.has():
+                await run_in_threadpool(SessionLocal.remove)
+            request_scope.reset(token)
+
+
+app.add_middleware(DBSessionScope)
+
+
 def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+    return SessionLocal()
 
 
 @app.on_event("startup")
@@ -33,11 +84,93 @@ def startup():
         print("✅ Database connection successful")
 
 
+@app.on_event("startup")
+async def open_pg_pool():
+    # asyncpg pool for the read-only analysis path
+    app.state.pg_pool = await create_pg_pool()
+
+
+@app.on_event("shutdown")
+async def close_pg_pool():
+    await app.state.pg_pool.close()
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
 
+# rows per multi-row INSERT statement; bounds parse/plan cost per statement
+INSERT_BATCH_SIZE = 1000
+
+# Insert templates are built once and executed with a list of row params, so
+# every ingest hits the same cached compiled statement instead of rendering a
+# fresh VALUES list per request. SQLAlchemy pages the rows into multi-row
+# VALUES batches of INSERT_BATCH_SIZE; RETURNING only yields rows that were
+# actually inserted (not skipped by ON CONFLICT), which is what we report.
+METRIC_INSERT = (
+    insert(models.MetricPoint)
+    .on_conflict_do_nothing(index_elements=["incident_id", "ts", "metric_name"])
+    .returning(models.MetricPoint.id)
+    .execution_options(insertmanyvalues_page_size=INSERT_BATCH_SIZE)
+)
+EVENT_INSERT = (
+    insert(models.Event)
+    .on_conflict_do_nothing(index_elements=["incident_id", "ts", "event_type"])
+    .returning(models.Event.id)
+    .execution_options(insertmanyvalues_page_size=INSERT_BATCH_SIZE)
+)
+
+# metric uploads above this size go through COPY instead of a multi-row INSERT
+COPY_THRESHOLD = 5000
+COPY_CHUNK_ROWS = 10_000  # rows per COPY buffer, keeps us well under MaxAllocSize
+
+
+def copy_metrics(db: Session, incident_id: str, metrics) -> int:
+    """COPY metrics into a temp table, then move them over with ON CONFLICT DO NOTHING.
+
+    Runs on the session's own connection, so it shares the request transaction.
+    Returns the number of rows actually inserted.
+    """
+    cur = db.connection().connection.cursor()
+    try:
+        # Naive and aware timestamps land in separate columns (the other one is
+        # NULL) so Postgres converts them exactly like the INSERT path does:
+        # naive values as-is, aware ones via timestamptz into the session TimeZone.
+        cur.execute(
+            "CREATE TEMP TABLE tmp_metric_points ("
+            " id varchar, incident_id varchar, ts_naive timestamp, ts_aware timestamptz,"
+            " metric_name varchar, value float8"
+            ") ON COMMIT DROP"
+        )
+        for start in range(0, len(metrics), COPY_CHUNK_ROWS):
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            for m in metrics[start:start + COPY_CHUNK_ROWS]:
+                # an empty unquoted CSV field is read as NULL
+                if m.ts.tzinfo is None:
+                    ts_naive, ts_aware = m.ts.isoformat(), ""
+                else:
+                    ts_naive, ts_aware = "", m.ts.isoformat()
+                writer.writerow((models.uuid_str(), incident_id, ts_naive, ts_aware, m.metric_name, m.value))
+            buf.seek(0)
+            cur.copy_expert(
+                "COPY tmp_metric_points (id, incident_id, ts_naive, ts_aware, metric_name, value) "
+                "FROM STDIN WITH (FORMAT csv)",
+                buf,
+            )
+
+        cur.execute(
+            "INSERT INTO metric_points (id, incident_id, ts, metric_name, value) "
+            "SELECT id, incident_id, COALESCE(ts_naive, ts_aware::timestamp), metric_name, value "
+            "FROM tmp_metric_points "
+            "ON CONFLICT (incident_id, ts, metric_name) DO NOTHING"
+        )
+        return cur.rowcount
+    finally:
+        cur.close()
+
+
 @app.post("/ingest", response_model=IngestResponse)
 def ingest(payload: IngestRequest, db: Session = Depends(get_db)):
     try:
@@ -56,31 +189,12 @@ def ingest(payload: IngestRequest, db: Session = Depends(get_db)):
             db.add(incident)
             db.flush()  # ensures incident.id is available
 
-        # 2) Insert metric points
-        metric_rows = [
-            models.MetricPoint(
-                incident_id=incident.id,
-                ts=m.ts,
-                metric_name=m.metric_name,
-                value=m.value,
-            )
-            for m in payload.metrics
-        ]
-
-        # 3) Insert events
-        event_rows = [
-            models.Event(
-                incident_id=incident.id,
-                ts=e.ts,
-                event_type=e.event_type,
-                meta=e.meta,
-            )
-            for e in payload.events
-        ]
-
-        # --- bulk insert metrics with ON CONFLICT DO NOTHING ---
-        if metric_rows:
-            stmt = insert(models.MetricPoint).values([
+        # 2) Bulk insert metric points with ON CONFLICT DO NOTHING
+        metrics_inserted = 0
+        if len(payload.metrics) > COPY_THRESHOLD:
+            metrics_inserted = copy_metrics(db, incident.id, payload.metrics)
+        elif payload.metrics:
+            inserted = db.execute(METRIC_INSERT, [
                 {
                     "incident_id": incident.id,
                     "ts": m.ts,
@@ -88,17 +202,13 @@ def ingest(payload: IngestRequest, db: Session = Depends(get_db)):
                     "value": m.value,
                 }
                 for m in payload.metrics
-            ]).on_conflict_do_nothing(
-                index_elements=["incident_id", "ts", "metric_name"]
-            )
-            result_metrics = db.execute(stmt)
-            metrics_inserted = result_metrics.rowcount or 0
-        else:
-            metrics_inserted = 0
-
-        # --- bulk insert events with ON CONFLICT DO NOTHING ---
-        if event_rows:
-            stmt = insert(models.Event).values([
+            ])
+            metrics_inserted = len(inserted.all())
+
+        # 3) Bulk insert events with ON CONFLICT DO NOTHING
+        events_inserted = 0
+        if payload.events:
+            inserted = db.execute(EVENT_INSERT, [
                 {
                     "incident_id": incident.id,
                     "ts": e.ts,
@@ -106,13 +216,8 @@ def ingest(payload: IngestRequest, db: Session = Depends(get_db)):
                     "meta": e.meta,
                 }
                 for e in payload.events
-            ]).on_conflict_do_nothing(
-                index_elements=["incident_id", "ts", "event_type"]
-            )
-            result_events = db.execute(stmt)
-            events_inserted = result_events.rowcount or 0
-        else:
-            events_inserted = 0
+            ])
+            events_inserted = len(inserted.all())
 
         db.commit()
 
@@ -128,140 +233,162 @@ def ingest(payload: IngestRequest, db: Session = Depends(get_db)):
 
 
 @app.get("/analysis/{incident_id}", response_model=AnalysisResponse)
-def analyze_incident(incident_id: str, db: Session = Depends(get_db)):
-    incident = db.get(models.Incident, incident_id)
-    if incident is None:
-        raise HTTPException(status_code=404, detail="Incident not found")
-
-    metric_points = (
-        db.query(models.MetricPoint)
-        .filter(models.MetricPoint.incident_id == incident_id)
-        .order_by(models.MetricPoint.metric_name, models.MetricPoint.ts)
-        .all()
-    )
-    events = (
-        db.query(models.Event)
-        .filter(models.Event.incident_id == incident_id)
-        .order_by(models.Event.ts)
-        .all()
-    )
+async def analyze_incident(incident_id: str, request: Request):
+    # read-only path: plain asyncpg records, no ORM objects and no worker
+    # thread held while waiting on the database
+    async with request.app.state.pg_pool.acquire() as conn:
+        exists = await conn.fetchval("SELECT 1 FROM incidents WHERE id = $1", incident_id)
+        if exists is None:
+            raise HTTPException(status_code=404, detail="Incident not found")
+
+        metric_points = await conn.fetch(
+            "SELECT metric_name, ts, value FROM metric_points "
+            "WHERE incident_id = $1 ORDER BY metric_name, ts",
+            incident_id,
+        )
+        events = await conn.fetch(
+            "SELECT id, ts, event_type, metadata AS meta FROM events "
+            "WHERE incident_id = $1 ORDER BY ts",
+            incident_id,
+        )
+
+    # the number crunching is CPU-bound, keep it off the event loop
+    return await run_in_threadpool(build_analysis, incident_id, metric_points, events)
 
+
+def build_analysis(incident_id: str, metric_points, events) -> AnalysisResponse:
+    """Score an incident from its metric rows (metric_name, ts, value), ordered by
+    (metric_name, ts), and its event rows (id, ts, event_type, meta), ordered by ts."""
     # ---- 1) group points by metric ----
-    by_metric = defaultdict(list)
-    for mp in metric_points:
-        by_metric[mp.metric_name].append(mp)
+    # rows arrive ordered by (metric_name, ts), so each metric is one contiguous run
+    by_metric = {
+        metric_name: list(rows)
+        for metric_name, rows in groupby(metric_points, key=itemgetter("metric_name"))
+    }
 
-    # ---- 2) detect point anomalies (z-score vs baseline) ----
+    # ---- 2) detect point anomalies (rolling z-score vs trailing baseline) ----
     point_anoms: list[AnomalyOut] = []
     z_threshold = 3.0
+    # a flat trailing window (std ~ 0) has no spread to scale by: score moves
+    # out of it against 10% of its level instead, and cap the reported z since
+    # it was not measured against real variance
+    flat_std_rel = 0.10
+    flat_z_cap = 6.0
+
+    # ---- 3) collapse anomalies into "episodes" per metric ----
+    # If anomalies are within 2 minutes, treat as one episode.
+    episode_gap = timedelta(minutes=2)
+    episode_gap_np = np.timedelta64(episode_gap)
+
+    episodes: list[Episode] = []
+    first_anomaly_ts = {}  # metric -> ts of its earliest anomaly, for tie-breaking
 
     for metric_name, pts in by_metric.items():
         if len(pts) < 12:
             continue
 
         baseline_n = min(30, max(10, len(pts) // 4))
-        baseline = pts[:baseline_n]
+        vals = np.fromiter((p["value"] for p in pts), dtype=np.float64, count=len(pts))
 
-        mean = sum(p.value for p in baseline) / len(baseline)
-        var = sum((p.value - mean) ** 2 for p in baseline) / len(baseline)
-        std = math.sqrt(var)
-        if std < 1e-9:
-            continue
+        # each point after the first baseline_n is scored against the baseline_n
+        # points right before it, so the baseline follows level shifts over time
+        windows = sliding_window_view(vals, baseline_n)[:-1]
+        mean = windows.mean(axis=1)
+        std = windows.std(axis=1, ddof=1)
 
-        for p in pts[baseline_n:]:
-            z = (p.value - mean) / std
-            if abs(z) >= z_threshold:
-                point_anoms.append(
-                    AnomalyOut(
-                        metric_name=metric_name,
-                        ts=p.ts,
-                        value=p.value,
-                        baseline_mean=mean,
-                        baseline_std=std,
-                        z_score=z,
-                    )
-                )
+        flat = std < 1e-9
+        std[flat] = np.maximum(flat_std_rel * np.abs(mean[flat]), 1e-9)
 
-    point_anoms.sort(key=lambda a: a.ts)
+        z = (vals[baseline_n:] - mean) / std
+        z[flat] = np.clip(z[flat], -flat_z_cap, flat_z_cap)
 
-    # ---- 3) collapse anomalies into "episodes" per metric ----
-    # If anomalies are within 2 minutes, treat as one episode.
-    episode_gap = timedelta(minutes=2)
+        # only build AnomalyOut for the points that cross the threshold
+        hits = np.nonzero(np.abs(z) >= z_threshold)[0]
+        if hits.size == 0:
+            continue
 
-    episodes = []  # each: dict(metric, start, end, max_abs_z, mean, std, max_value)
-    by_metric_anoms = defaultdict(list)
-    for a in point_anoms:
-        by_metric_anoms[a.metric_name].append(a)
-
-    for metric_name, anoms in by_metric_anoms.items():
-        current = None
-        for a in anoms:
-            if current is None:
-                current = {
-                    "metric": metric_name,
-                    "start": a.ts,
-                    "end": a.ts,
-                    "max_abs_z": abs(a.z_score),
-                    "baseline_mean": a.baseline_mean,
-                    "baseline_std": a.baseline_std,
-                    "max_value": a.value,
-                }
-                continue
-
-            if a.ts - current["end"] <= episode_gap:
-                current["end"] = a.ts
-                current["max_abs_z"] = max(current["max_abs_z"], abs(a.z_score))
-                current["max_value"] = max(current["max_value"], a.value)
-            else:
-                episodes.append(current)
-                current = {
-                    "metric": metric_name,
-                    "start": a.ts,
-                    "end": a.ts,
-                    "max_abs_z": abs(a.z_score),
-                    "baseline_mean": a.baseline_mean,
-                    "baseline_std": a.baseline_std,
-                    "max_value": a.value,
-                }
-        if current is not None:
-            episodes.append(current)
+        for i in hits:
+            p = pts[baseline_n + i]
+            point_anoms.append(
+                AnomalyOut(
+                    metric_name=metric_name,
+                    ts=p["ts"],
+                    value=p["value"],
+                    baseline_mean=float(mean[i]),
+                    baseline_std=float(std[i]),
+                    z_score=float(z[i]),
+                )
+            )
+
+        first_anomaly_ts[metric_name] = pts[baseline_n + hits[0]]["ts"]
+
+        # split the (ts-ordered) hits wherever the gap exceeds episode_gap,
+        # then reduce each group in one call instead of a per-anomaly loop
+        hit_ts = np.array([pts[baseline_n + i]["ts"] for i in hits], dtype="datetime64[us]")
+        starts = np.concatenate(([0], np.nonzero(np.diff(hit_ts) > episode_gap_np)[0] + 1))
+        ends = np.append(starts[1:], hits.size) - 1
+        max_abs_z = np.maximum.reduceat(np.abs(z[hits]), starts)
+        max_value = np.maximum.reduceat(vals[baseline_n + hits], starts)
+
+        for k in range(starts.size):
+            episodes.append(Episode(
+                metric=metric_name,
+                start=pts[baseline_n + hits[starts[k]]]["ts"],
+                end=pts[baseline_n + hits[ends[k]]]["ts"],
+                max_abs_z=float(max_abs_z[k]),
+                # baseline as it stood when the episode began
+                baseline_mean=float(mean[hits[starts[k]]]),
+                baseline_std=float(std[hits[starts[k]]]),
+                max_value=float(max_value[k]),
+            ))
 
-    episodes.sort(key=lambda e: e["start"])
+    point_anoms.sort(key=lambda a: a.ts)
+    # episodes starting at the same instant are ordered by their metric's first
+    # anomaly (then metric name, via the stable sort), which fixes which
+    # evidence lines a cause ends up showing
+    episodes.sort(key=lambda e: (e.start, first_anomaly_ts[e.metric]))
 
     episodes_out: list[EpisodeOut] = []
 
     for ep in episodes:
         pct = 0.0
-        if ep["baseline_mean"] and abs(ep["baseline_mean"]) > 1e-9:
-            pct = (ep["max_value"] - ep["baseline_mean"]) / ep["baseline_mean"] * 100.0
+        if ep.baseline_mean and abs(ep.baseline_mean) > 1e-9:
+            pct = (ep.max_value - ep.baseline_mean) / ep.baseline_mean * 100.0
 
         episodes_out.append(
             EpisodeOut(
-                metric_name=ep["metric"],  # <-- FIXED comma issue
-                start_ts=ep["start"],
-                end_ts=ep["end"],
-                baseline_mean=ep["baseline_mean"],
-                baseline_std=ep["baseline_std"],
-                peak_value=ep["max_value"],
-                peak_z_score=ep["max_abs_z"],
+                metric_name=ep.metric,  # <-- FIXED comma issue
+                start_ts=ep.start,
+                end_ts=ep.end,
+                baseline_mean=ep.baseline_mean,
+                baseline_std=ep.baseline_std,
+                peak_value=ep.max_value,
+                peak_z_score=ep.max_abs_z,
                 percent_change=round(pct, 2),
             )
         )
 
     # ---- 4) compute multi-metric agreement (episode overlap) ----
     # if latency + error_rate overlap in time, boost.
-    def overlaps(a_start, a_end, b_start, b_end) -> bool:
-        return not (a_end < b_start or b_end < a_start)
+    # sweep over start/end events instead of testing every pair; starts sort
+    # before ends at the same ts so touching episodes still count as overlapping
+    sweep = []
+    for i, ep in enumerate(episodes):
+        sweep.append((ep.start, 0, i))
+        sweep.append((ep.end, 1, i))
+    sweep.sort(key=lambda s: (s[0], s[1]))
 
     agreement_bonus = defaultdict(float)  # episode_index -> bonus
-    for i, e1 in enumerate(episodes):
-        for j, e2 in enumerate(episodes):
-            if i >= j:
-                continue
-            if overlaps(e1["start"], e1["end"], e2["start"], e2["end"]):
-                # simple: boost both
-                agreement_bonus[i] += 0.35
-                agreement_bonus[j] += 0.35
+    active = set()
+    for _, kind, i in sweep:
+        if kind == 1:
+            active.discard(i)
+            continue
+        for j in active:
+            # simple: boost both
+            agreement_bonus[i] += 0.35
+            agreement_bonus[j] += 0.35
+        active.add(i)
 
     # ---- 5) link episodes to events & score causes ----
     # event priors (feel free to tweak later)
@@ -274,68 +401,92 @@ def analyze_incident(incident_id: str, db: Session = Depends(get_db)):
     }
 
     window = timedelta(minutes=10)
+    window_s = window.total_seconds()
+
+    # events as flat arrays for vectorized window matching
+    ev_ts = np.array([ev["ts"] for ev in events], dtype="datetime64[us]")
+    ev_prior = np.array([event_prior.get(ev["event_type"], 0.6) for ev in events])  # default mid
+
+    ep_start = np.array([ep.start for ep in episodes], dtype="datetime64[us]")
+
+    # events are ordered by ts, so each episode's in-window events form one
+    # contiguous slice; find all slice bounds with a single binary search
+    window_np = np.timedelta64(window)
+    ev_lo = np.searchsorted(ev_ts, ep_start - window_np, side="left")
+    ev_hi = np.searchsorted(ev_ts, ep_start + window_np, side="right")
 
     # score per event id
-    cause = {}  # ev.id -> dict(score, evidence, event)
+    cause = {}  # ev["id"] -> dict(score, evidence, event)
     max_possible = 0.0
 
     for idx, ep in enumerate(episodes):
         # severity: cap z so it doesn't explode
-        severity = min(10.0, ep["max_abs_z"]) / 10.0  # 0..1
+        severity = min(10.0, ep.max_abs_z) / 10.0  # 0..1
         sev_weight = 0.55 + 0.45 * severity  # 0.55..1.0
 
         agree = min(0.6, agreement_bonus.get(idx, 0.0))  # 0..0.6
         agree_weight = 1.0 + agree  # 1.0..1.6
 
         # best matching event(s) in window
-        for ev in events:
-            dt = abs(ep["start"] - ev.ts)
-            if dt <= window:
-                proximity = max(0.0, 1.0 - (dt.total_seconds() / window.total_seconds()))  # 0..1
-                prior = event_prior.get(ev.event_type, 0.6)  # default mid
+        lo, hi = ev_lo[idx], ev_hi[idx]
+        if lo == hi:
+            continue
 
-                # episode contributes:
-                contrib = proximity * prior * sev_weight * agree_weight
+        dt_s = np.abs(ev_ts[lo:hi] - ep_start[idx]) / np.timedelta64(1, "s")
+        proximity = np.maximum(0.0, 1.0 - dt_s / window_s)  # 0..1
 
-                max_possible = max(max_possible, contrib)  # for normalization hint (not strict)
+        # episode contributes:
+        contribs = proximity * ev_prior[lo:hi] * sev_weight * agree_weight
 
-                if ev.id not in cause:
-                    cause[ev.id] = {"score": 0.0, "evidence": [], "event": ev}
+        max_possible = max(max_possible, float(contribs.max()))  # for normalization hint (not strict)
 
-                cause[ev.id]["score"] += contrib
+        pct = 0.0
+        if ep.baseline_mean > 1e-9:
+            pct = (ep.max_value - ep.baseline_mean) / ep.baseline_mean * 100.0
 
-                pct = 0.0
-                if ep["baseline_mean"] > 1e-9:
-                    pct = (ep["max_value"] - ep["baseline_mean"]) / ep["baseline_mean"] * 100.0
+        for k, contrib in enumerate(contribs):
+            ev = events[lo + k]
+            entry = cause.get(ev["id"])
+            if entry is None:
+                entry = cause[ev["id"]] = {"score": 0.0, "evidence": [], "event": ev}
 
-                cause[ev.id]["evidence"].append(
-                    f"{ep['metric']} abnormal {ep['start'].isoformat()}–{ep['end'].isoformat()}: "
-                    f"{ep['baseline_mean']:.2f} → {ep['max_value']:.2f} ({pct:+.1f}%), "
-                    f"z≈{ep['max_abs_z']:.2f}, event within {int(dt.total_seconds())}s"
-                )
+            entry["score"] += float(contrib)
+
+            # keep raw parts only; text is rendered for the causes we return
+            if len(entry["evidence"]) < MAX_EVIDENCE:
+                entry["evidence"].append((ep, pct, int(dt_s[k])))
 
     # ---- 6) build response ----
     # return point anomalies (fine for now) + ranked causes
     causes: list[CauseOut] = []
     if cause:
         max_score = max(v["score"] for v in cause.values()) or 1.0
-        for v in cause.values():
+        ranked = sorted(
+            cause.values(),
+            key=lambda v: round(v["score"] / max_score, 3),
+            reverse=True,
+        )
+        for v in ranked[:MAX_CAUSES]:
             ev = v["event"]
             conf = v["score"] / max_score
             causes.append(
                 CauseOut(
-                    event_type=ev.event_type,
-                    ts=ev.ts,
-                    meta=ev.meta,
+                    event_type=ev["event_type"],
+                    ts=ev["ts"],
+                    meta=ev["meta"],
                     confidence=round(conf, 3),
-                    evidence=v["evidence"][:6],
+                    evidence=[
+                        f"{ep.metric} abnormal {ep.start.isoformat()}–{ep.end.isoformat()}: "
+                        f"{ep.baseline_mean:.2f} → {ep.max_value:.2f} ({pct:+.1f}%), "
+                        f"z≈{ep.max_abs_z:.2f}, event within {dt}s"
+                        for ep, pct, dt in v["evidence"]
+                    ],
                 )
             )
-        causes.sort(key=lambda c: c.confidence, reverse=True)
 
     return AnalysisResponse(
         incident_id=incident_id,
         anomalies=point_anoms,
         episodes=episodes_out,  # 👈 this is why we built it
-        likely_causes=causes[:5],
+        likely_causes=causes,
     )
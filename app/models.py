@@ -61,4 +61,10 @@ class Event(Base):
 # Helpful indexes for speed
 Index("ix_metric_incident_ts", MetricPoint.incident_id, MetricPoint.ts)
 Index("ix_event_incident_ts", Event.incident_id, Event.ts)
-Index("ix_metric_incident_name_ts", MetricPoint.incident_id, MetricPoint.metric_name, MetricPoint.ts)
+# covers the analysis scan (WHERE incident_id ORDER BY metric_name, ts) incl. value,
+# so postgres can serve it as an index-only scan with no sort node
+Index(
+    "ix_metric_incident_name_ts",
+    MetricPoint.incident_id, MetricPoint.metric_name, MetricPoint.ts,
+    postgresql_include=["value"],
+)